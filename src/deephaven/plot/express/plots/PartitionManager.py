@@ -4,19 +4,20 @@ from collections.abc import Generator, Callable
 from typing import Any
 
 import plotly.express as px
-from pandas import DataFrame
+import pyarrow as pa
 
 from deephaven.table import Table, PartitionedTable
+from deephaven import arrow as dharrow
 from deephaven import pandas as dhpd
-from deephaven import merge
+from deephaven import merge, DHError
 
 from ._layer import layer
 from .. import DeephavenFigure
 from ..preprocess.Preprocessor import Preprocessor
 from ..shared import get_unique_names
 
-PARTITION_ARGS = {
-    "by": None,
+# the style args that partition the table, mapped to their (sequence, map) args
+STYLE_ARGS = {
     "color": ("color_discrete_sequence", "color_discrete_map"),
     "pattern_shape": ("pattern_shape_sequence", "pattern_shape_map"),
     "symbol": ("symbol_sequence", "symbol_map"),
@@ -25,17 +26,52 @@ PARTITION_ARGS = {
     "width": ("width_sequence", "width_map")
 }
 
-FACET_ARGS = {
+# "by" partitions the table without applying any style
+PARTITION_ARGS = ("by", *STYLE_ARGS)
+
+# the style args that map to a (sequence, map) pair, keyed by the by arg name
+SEQUENCE_MAP_OF = {f"{arg}_by": seq_map for arg, seq_map in STYLE_ARGS.items()}
+
+# a tuple so facets are always added to the partition columns in the same order
+FACET_ARGS = (
     "facet_row", "facet_col"
-}
+)
 
-NUMERIC_TYPES = {
+NUMERIC_TYPES = frozenset({
     "short",
     "int",
     "long",
     "float",
     "double",
-}
+})
+
+# numeric types from narrowest to widest, used to pick the type that mixed
+# numeric columns are widened to when they are combined in long mode
+NUMERIC_PROMOTION_ORDER = (
+    "byte",
+    "short",
+    "char",
+    "int",
+    "long",
+    "float",
+    "double",
+)
+
+# groups that need the table preprocessed even if it isn't partitioned
+PREPROCESS_GROUPS = frozenset({
+    "preprocess_hist", "preprocess_freq", "preprocess_time"
+})
+
+# plot by args that can be bound directly to the marker with an "identity" map
+IDENTITY_ARGS = frozenset({
+    "color", "pattern_shape", "symbol", "line_dash", "width"
+})
+
+# plot by args that are passed to plotly express directly for a single
+# numeric column, color only if there is a continuous scale
+NUMERIC_ARGS = frozenset({
+    "color", "size"
+})
 
 # color, symbol, line_dash and pattern_shape are plotly defaults
 STYLE_DEFAULTS = {
@@ -48,43 +84,86 @@ STYLE_DEFAULTS = {
 }
 
 
+def get_key_tuples(
+        key_table: Table
+) -> list[tuple[Any]]:
+    """
+    Get the rows of a (usually small) key table as tuples. The rows are pulled
+    through arrow, falling back to pandas for column types that can't be
+    converted to arrow.
+
+    Args:
+        key_table: Table: The table containing only the key columns
+
+    Returns:
+        list[tuple[Any]]: A tuple of the values of each row, in table order
+    """
+    try:
+        # each row dict is ordered by the table columns
+        return [tuple(row.values()) for row in dharrow.to_arrow(key_table).to_pylist()]
+    except (DHError, pa.ArrowException):
+        return list(dhpd.to_pandas(key_table).itertuples(index=False, name=None))
+
+
 def get_partition_key_column_tuples(
-        key_column_table: DataFrame,
+        keys: list[tuple[Any]],
+        key_columns: list[str],
         columns: list[str]
 ) -> list[tuple[Any]]:
     """
 
     Args:
-        key_column_table: DataFrame: The table containing the key columns
-        columns: list[str]: The columns to pull from the table
+        keys: list[tuple[Any]]: The key tuples, ordered by key_columns
+        key_columns: list[str]: The key columns of the partitioned table
+        columns: list[str]: The columns to pull from the keys
 
     Returns:
         A list of tuples of the columns
     """
-    list_columns = []
-    for column in columns:
-        list_columns.append(key_column_table[column].tolist())
+    missing = [col for col in columns if col not in key_columns]
+    if missing:
+        raise ValueError(f"Columns {missing} are not key columns of the partitioned table")
+
+    indices = [key_columns.index(col) for col in columns]
+    return [tuple(key[i] for i in indices) for key in keys]
+
+
+def get_promoted_type(
+        types: set[str]
+) -> str | None:
+    """
+    Get the type that columns of the given types need to be widened to so
+    they can be combined into one column. This is the widest of the types,
+    the same type a ternary over the columns would have. Since char is
+    unsigned, it is widened to int when mixed with byte or short.
+
+    Args:
+        types: set[str]: The java type names of the columns
 
-    return list(zip(*list_columns))
+    Returns:
+        str | None: The promoted type, or None if the columns don't need to
+          be widened because they already share a type or are not all numeric
+    """
+    if len(types) < 2 or not types <= set(NUMERIC_PROMOTION_ORDER):
+        return None
+    promoted = max(types, key=NUMERIC_PROMOTION_ORDER.index)
+    return "int" if promoted == "char" else promoted
 
 
 def numeric_column_set(
-        table: Table,
+        table: Table | PartitionedTable,
 ) -> set[str]:
     """Gets the set of numeric columns in the table
 
     Args:
-      table: Table: The table to pull columns from
+      table: Table | PartitionedTable: The table to pull columns from
 
     Returns:
       set[str]: set of numeric columns
     """
-    numeric_cols = set()
-    for col in table.columns:
-        type_ = col.data_type.j_name
-        if type_ in NUMERIC_TYPES:
-            numeric_cols.add(col.name)
-    return numeric_cols
+    table_columns = table.constituent_table_columns \
+        if isinstance(table, PartitionedTable) else table.columns
+    return {col.name for col in table_columns if col.data_type.j_name in NUMERIC_TYPES}
 
 
 def is_single_numeric_col(
@@ -101,7 +180,12 @@ def is_single_numeric_col(
     Returns:
         bool: True if the column is a single numeric column, false otherwise
     """
-    return (isinstance(val, str) or len(val) == 1) and val in numeric_cols
+    if isinstance(val, list):
+        # a list can't be checked against the set directly
+        if len(val) != 1:
+            return False
+        val = val[0]
+    return val in numeric_cols
 
 
 class PartitionManager:
@@ -133,6 +217,10 @@ class PartitionManager:
         preprocessor: Preprocessor: The preprocessor, used for some plot types
         partitioned_table: PartitionedTable: The partitioned table created (or
           passed in if already created)
+        numeric_cols: set[str]: The numeric columns of the table, only pulled
+          if needed
+        row_keys: list[tuple[Any]]: The key of each row of the partitioned
+          table, one per constituent table, only pulled if needed
         draw_figure: Callable: The function used to draw the figure
     """
     def __init__(
@@ -162,6 +250,8 @@ class PartitionManager:
         self.args = args
         self.groups = groups
         self.preprocessor = None
+        self.numeric_cols = None
+        self.row_keys = None
         self.set_long_mode_variables()
         self.convert_table_to_long_mode()
         self.partitioned_table = self.process_partitions()
@@ -224,6 +314,18 @@ class PartitionManager:
 
         args["table"] = self.to_long_mode(table, self.cols)
 
+    def get_numeric_cols(self) -> set[str]:
+        """
+        Get the numeric columns of the table. These are only needed for some
+        args, so they are pulled the first time they are needed and reused.
+
+        Returns:
+            set[str]: The set of numeric columns
+        """
+        if self.numeric_cols is None:
+            self.numeric_cols = numeric_column_set(self.args["table"])
+        return self.numeric_cols
+
     def is_by(
             self,
             arg: str,
@@ -237,7 +339,7 @@ class PartitionManager:
             arg: The arg that is a by arg
             map_val: The value of the map
         """
-        seq_arg = PARTITION_ARGS[arg][0]
+        seq_arg, map_arg = STYLE_ARGS[arg]
         if not self.args[seq_arg]:
             self.args[seq_arg] = STYLE_DEFAULTS[arg]
 
@@ -248,7 +350,6 @@ class PartitionManager:
             self.args[f"attached_{arg}"] = new_col
             self.args.pop(arg)
         else:
-            map_arg = PARTITION_ARGS[arg][1]
             map_val = self.args[map_arg]
             if map_val == "by":
                 self.args[map_arg] = None
@@ -262,7 +363,7 @@ class PartitionManager:
             self,
             arg: str,
             val: str | list[str]
-    ) -> tuple[str, str | list[str]]:
+    ) -> tuple[str, list[str]]:
         """
         Handle all args that are possibly plot bys.
         If the "val" is none and the "by" arg is specified,
@@ -284,72 +385,50 @@ class PartitionManager:
             val: str | list[str]: The column or columns for the arguments
 
         Returns:
-            tuple[str, str | list[str]]: A tuple of (f"{arg}_by", arg_by value)
-            to use to partition the table
+            tuple[str, list[str]]: A tuple of (f"{arg}_by", arg_by columns)
+            to use to partition the table. The columns are empty if the arg
+            is not a plot by.
         """
         args = self.args
-        table = args["table"]
-        table = table if isinstance(table, Table) else table.constituent_tables[0]
-        numeric_cols = numeric_column_set(table)
+
+        if arg not in STYLE_ARGS:
+            # "by" itself has no style to apply
+            return f"{arg}_by", []
 
         plot_by_cols = args.get("by", None)
+        seq_name, map_name = STYLE_ARGS[arg]
+        map_ = args[map_name]
+
+        if map_ == "by" or isinstance(map_, dict):
+            self.is_by(arg, map_)
+        elif map_ == "identity" and arg in IDENTITY_ARGS:
+            args.pop(map_name)
+            args[f"attached_{arg}"] = args.pop(arg)
+        # the numeric columns are only pulled once the cheaper checks pass
+        elif val and arg in NUMERIC_ARGS \
+                and (arg != "color" or "color_continuous_scale" in args) \
+                and is_single_numeric_col(val, self.get_numeric_cols()):
+            if isinstance(val, list):
+                # plotly express needs the column name, not a one element list
+                args[arg] = val[0]
+            if arg == "color" and "always_attached" in self.groups:
+                args["colors"] = args.pop("color")
+            # just keep the argument in place so it can be passed to plotly
+            # express directly
+        elif val:
+            self.is_by(arg, map_)
+        elif plot_by_cols and (args.get(seq_name) or arg in self.by_vars):
+            # this needs to be last as setting the arg in any sense will override
+            if not args[seq_name]:
+                args[seq_name] = STYLE_DEFAULTS[arg]
+            args[f"{arg}_by"] = plot_by_cols
 
         if arg == "color":
-            map_name = "color_discrete_map"
-            map_ = args[map_name]
-            if map_ == "by" or isinstance(map_, dict):
-                self.is_by(arg, args[map_name])
-            elif map_ == "identity":
-                args.pop(map_name)
-                args["attached_color"] = args.pop("color")
-            elif val and is_single_numeric_col(val, numeric_cols) and "color_continuous_scale" in self.args:
-                if "always_attached" in self.groups:
-                    args["colors"] = args.pop("color")
-                # just keep the argument in place so it can be passed to plotly
-                # express directly
-                pass
-            elif val:
-                self.is_by(arg, args[map_name])
-            elif plot_by_cols and (args.get("color_discrete_sequence") or "color" in self.by_vars):
-                # this needs to be last as setting "color" in any sense will override
-                if not self.args["color_discrete_sequence"]:
-                    self.args["color_discrete_sequence"] = STYLE_DEFAULTS[arg]
-                args["color_by"] = plot_by_cols
-
             # save whatever column is being used for colors for marginals
             self.marg_color = args.get("color_by", None)
 
-        elif arg == "size":
-            map_ = args["size_map"]
-            if map_ == "by" or isinstance(map_, dict):
-                self.is_by(arg)
-            elif val and is_single_numeric_col(val, numeric_cols):
-                # just keep the argument in place so it can be passed to plotly
-                # express directly
-                pass
-            elif val:
-                self.is_by(arg)
-            elif plot_by_cols and (args.get("size_sequence") or "size" in self.by_vars):
-                if not self.args["size_sequence"]:
-                    self.args["size_sequence"] = STYLE_DEFAULTS[arg]
-                args["size_by"] = plot_by_cols
-
-        elif arg in {"pattern_shape", "symbol", "line_dash", "width"}:
-            seq_name, map_name = PARTITION_ARGS[arg][0], PARTITION_ARGS[arg][1]
-            seq, map_ = args[seq_name], args[map_name]
-            if map_ == "by" or isinstance(map_, dict):
-                self.is_by(arg, args[map_name])
-            elif map_ == "identity":
-                args.pop(map_name)
-                args[f"attached_{arg}"] = args.pop(arg)
-            elif val:
-                self.is_by(arg, args[map_name])
-            elif plot_by_cols and (args.get(seq_name) or arg in self.by_vars):
-                if not seq:
-                    self.args[seq_name] = STYLE_DEFAULTS[arg]
-                args[f"{arg}_by"] = plot_by_cols
-
-        return f"{arg}_by", args.get(f"{arg}_by", None)
+        cols = args.get(f"{arg}_by", None)
+        return f"{arg}_by", [cols] if isinstance(cols, str) else cols or []
 
     def process_partitions(
             self
@@ -369,8 +448,11 @@ class PartitionManager:
         args = self.args
 
         partitioned_table = None
-        partition_cols = set()
-        partition_map = {}
+        # a dict is used as an ordered set so the table is always
+        # partitioned on the columns in the same order
+        partition_cols = {}
+        partition_map = []
+        to_drop = {"by", "by_vars"}
 
         by_vars = args.get("by_vars", None)
         if by_vars:
@@ -381,17 +463,21 @@ class PartitionManager:
         if isinstance(args["table"], PartitionedTable):
             partitioned_table = args["table"]
 
-        for arg, val in list(args.items()):
-            if (val or args.get("by", None)) and arg in PARTITION_ARGS:
+        plot_by_cols = args.get("by", None)
+        for arg in PARTITION_ARGS:
+            if arg not in args:
+                continue
+            val = args[arg]
+            if val or plot_by_cols:
                 arg_by, cols = self.handle_plot_by_arg(arg, val)
                 if cols:
-                    partition_map[arg_by] = cols
-                    if isinstance(cols, list):
-                        partition_cols.update([col for col in cols])
-                    else:
-                        partition_cols.add(cols)
-            elif val and arg in FACET_ARGS:
-                partition_cols.add(val)
+                    partition_map.append((arg_by, cols))
+                    partition_cols.update(dict.fromkeys(cols))
+
+        for arg in FACET_ARGS:
+            val = args.get(arg, None)
+            if val:
+                partition_cols[val] = None
                 if arg == "facet_row":
                     self.facet_row = val
                 else:
@@ -401,7 +487,7 @@ class PartitionManager:
         # so partitioning is still needed on that column but it won't
         # affect styles
         if self.pivot_vars:
-            partition_cols.add(self.pivot_vars["variable"])
+            partition_cols[self.pivot_vars["variable"]] = None
 
         # preprocessor needs to be initialized after the always attached arguments are found
         self.preprocessor = Preprocessor(args, self.groups, self.always_attached, self.pivot_vars)
@@ -410,50 +496,75 @@ class PartitionManager:
             if not partitioned_table:
                 partitioned_table = args["table"].partition_by(list(partition_cols))
 
-            key_column_table = dhpd.to_pandas(partitioned_table.table.select_distinct(partitioned_table.key_columns))
-            for arg_by, val in partition_map.items():
-                # remove "by" from arg
-                arg = arg_by[:-3]
-                if arg in PARTITION_ARGS and isinstance(PARTITION_ARGS[arg], tuple):
+            key_columns = partitioned_table.key_columns
+            distinct_keys = self.get_distinct_keys(partitioned_table)
+            for arg_by, val in partition_map:
+                if arg_by in SEQUENCE_MAP_OF:
                     # replace the sequence with the sequence, map and distinct keys
                     # so they can be easily used together
-                    keys = get_partition_key_column_tuples(key_column_table, val if isinstance(val, list) else [val])
-                    sequence, map_ = PARTITION_ARGS[arg]
+                    if list(val) == list(key_columns):
+                        # the styled columns are exactly the key columns, so
+                        # the keys can be used as is
+                        keys = distinct_keys
+                    else:
+                        keys = get_partition_key_column_tuples(distinct_keys, key_columns, val)
+                    sequence, map_ = SEQUENCE_MAP_OF[arg_by]
                     args[sequence] = {
                         "ls": args[sequence],
                         "map_": args[map_],
                         "keys": keys
                     }
-                    args.pop(arg_by)
-                    args.pop(PARTITION_ARGS[arg][1])
-            args.pop("by")
-            args.pop("by_vars", None)
-            return partitioned_table
+                    to_drop.update((arg_by, map_))
 
-        args.pop("by", None)
-        args.pop("by_vars", None)
-        return args["table"]
+        # args is shared with the caller, so the keys are removed in place
+        for arg in to_drop:
+            args.pop(arg, None)
 
-    def build_ternary_chain(
+        return partitioned_table if partition_cols else args["table"]
+
+    def get_distinct_keys(
             self,
-            cols: list[str]
-    ) -> str:
+            partitioned_table: PartitionedTable
+    ) -> list[tuple[Any]]:
+        """
+        Get the distinct keys of the partitioned table, used to build the key
+        lists for styles. These are not paired with the constituent tables,
+        see get_constituents for that.
+
+        Args:
+            partitioned_table: PartitionedTable: The table to pull keys from
+
+        Returns:
+            list[tuple[Any]]: The distinct key tuples
+        """
+        if partitioned_table.unique_keys:
+            # each row already has a distinct key, so the row keys are
+            # already distinct and can be shared with the constituents
+            return self.get_row_keys(partitioned_table)
+        return get_key_tuples(partitioned_table.table.select_distinct(partitioned_table.key_columns))
+
+    def get_row_keys(
+            self,
+            partitioned_table: PartitionedTable
+    ) -> list[tuple[Any]]:
         """
-        Build a ternary chain that will collapse the columns into one
+        Get the key of each row of the partitioned table, which is one key per
+        constituent table, in the same order as the constituents. A static
+        table can't change, so its keys are pulled once and reused. A
+        refreshing table's keys are pulled again every time so they match
+        the constituents read with them.
 
         Args:
-            cols: list[str]: the list of columns to collapse into one column
+            partitioned_table: PartitionedTable: The table to pull keys from
 
         Returns:
-            The ternary string that builds the new column
+            list[tuple[Any]]: The key tuples, one per constituent table
         """
-        ternary_string = f"{self.pivot_vars['value']} = "
-        for i, col in enumerate(cols):
-            if i == len(cols) - 1:
-                ternary_string += f"{col}"
-            else:
-                ternary_string += f"{self.pivot_vars['variable']} == `{col}` ? {col} : "
-        return ternary_string
+        if self.row_keys is None or partitioned_table.table.is_refreshing:
+            self.row_keys = get_key_tuples(
+                partitioned_table.table.view(partitioned_table.key_columns)
+            )
+        return self.row_keys
 
     def to_long_mode(
             self,
@@ -473,32 +584,48 @@ class PartitionManager:
             The table converted to long mode
 
         """
-        new_tables = []
-        for col in cols:
-            new_tables.append(table.update_view(f"{self.pivot_vars['variable']} = `{col}`"))
+        variable, value = self.pivot_vars["variable"], self.pivot_vars["value"]
+
+        # each branch needs the same value type to be merged, so widen mixed
+        # numeric columns to the widest of their types
+        col_types = {col.name: col.data_type.j_name for col in table.columns}
+        missing = [col for col in cols if col not in col_types]
+        if missing:
+            raise ValueError(f"Columns {missing} are not in the table")
 
-        merged = merge(new_tables)
+        promoted = get_promoted_type({col_types[col] for col in cols})
+        casts = {
+            col: f"({promoted}) " if promoted and col_types[col] != promoted else ""
+            for col in cols
+        }
 
-        transposed = merged.update_view(self.build_ternary_chain(cols))
+        # each branch already contains its value, so the merged table does
+        # not need to be projected again
+        formulas = [[f"{variable} = `{col}`", f"{value} = {casts[col]}{col}"] for col in cols]
+        new_tables = [table.update_view(formula) for formula in formulas]
 
-        return transposed.drop_columns(cols)
+        return merge(new_tables).drop_columns(cols)
 
-    def current_partition_generator(self) -> Generator[dict[str, str]]:
+    def get_constituents(self) -> list[tuple[Table, dict[str, Any]]]:
         """
-        Generate a partition dictionary for the current partition that maps
-        column to value
+        Get the constituent tables of the partitioned table, each paired with
+        its partition. The keys are read from the same rows as the
+        constituents, one row per constituent, so each table is paired with
+        its own key even if the keys are not unique. Both are read together,
+        right before the figure is generated.
 
-        Yields:
-            dict[str, str]: The partition dictionary mapping column to value
+        Returns:
+            list[tuple[Table, dict[str, Any]]]: A list of tuples of
+              (constituent table, partition dictionary mapping key column to value)
         """
-        for table in self.partitioned_table.constituent_tables:
-            key_column_table = dhpd.to_pandas(table.select_distinct(self.partitioned_table.key_columns))
-            current_partition = dict(zip(
-                self.partitioned_table.key_columns,
-                get_partition_key_column_tuples(key_column_table,
-                                                self.partitioned_table.key_columns)[0]
-            ))
-            yield current_partition
+        partitioned_table = self.partitioned_table
+        key_columns = partitioned_table.key_columns
+
+        keys = self.get_row_keys(partitioned_table)
+        return [
+            (table, dict(zip(key_columns, key)))
+            for table, key in zip(partitioned_table.constituent_tables, keys)
+        ]
 
     def table_partition_generator(self) -> Generator[tuple[Table, dict[str, str]]]:
         """
@@ -509,10 +636,13 @@ class PartitionManager:
             tuple[Table, dict[str, str]: The tuple of table and current partition
 
         """
-        constituents = self.partitioned_table.constituent_tables
+        constituents = self.get_constituents()
         column = self.pivot_vars["value"] if self.pivot_vars else None
-        tables = self.preprocessor.preprocess_partitioned_tables(constituents, column)
-        for table, current_partition in zip(tables, self.current_partition_generator()):
+        tables = self.preprocessor.preprocess_partitioned_tables(
+            [table for table, _ in constituents], column
+        )
+
+        for table, (_, current_partition) in zip(tables, constituents):
             yield table, current_partition
 
     def partition_generator(self) -> Generator[dict[str, Any]]:
@@ -524,23 +654,26 @@ class PartitionManager:
             dict[str, Any]: The args used to create a figure
         """
         args, partitioned_table = self.args, self.partitioned_table
-        if hasattr(partitioned_table, "constituent_tables"):
+        if isinstance(partitioned_table, PartitionedTable):
             for table, current_partition in self.table_partition_generator():
+                # each partition gets its own args so updates to one partition
+                # can't leak into the next
+                call_args = dict(args)
                 if isinstance(table, tuple):
                     # if a tuple is returned here, it was preprocessed already so pivots aren't needed
                     table, arg_update = table
-                    args.update(arg_update)
+                    call_args.update(arg_update)
                 elif self.pivot_vars and self.pivot_vars["value"]:
                     # there is a list of variables, so replace them with the combined column
-                    args[self.list_var] = self.pivot_vars["value"]
+                    call_args[self.list_var] = self.pivot_vars["value"]
 
-                args["current_partition"] = current_partition
+                call_args["current_partition"] = current_partition
 
-                args["table"] = table
-                yield args
-        elif "preprocess_hist" in self.groups or "preprocess_freq" in self.groups or "preprocess_time" in self.groups:
+                call_args["table"] = table
+                yield call_args
+        elif self.groups & PREPROCESS_GROUPS:
             # still need to preprocess the base table
-            table, arg_update = list(self.preprocessor.preprocess_partitioned_tables([args["table"]]))[0]
+            table, arg_update = next(self.preprocessor.preprocess_partitioned_tables([args["table"]]))
             args["table"] = table
             args.update(arg_update)
             yield args
@@ -557,27 +690,28 @@ class PartitionManager:
         """
         trace_generator = None
         figs = []
+
+        # every partition has the same key columns, so the offsetgroup
+        # prefix only needs to be joined once
+        offsetgroup_prefix = "-".join(self.partitioned_table.key_columns) \
+            if isinstance(self.partitioned_table, PartitionedTable) else ""
+
+        is_hist_or_violin = "preprocess_hist" in self.groups or "preprocess_violin" in self.groups
+
         for i, args in enumerate(self.partition_generator()):
             fig = self.draw_figure(call_args=args, trace_generator=trace_generator)
             if not trace_generator:
                 trace_generator = fig.trace_generator
 
-            facet_key = []
-            if "current_partition" in args:
-                partition = args["current_partition"]
-                if "preprocess_hist" in self.groups or "preprocess_violin" in self.groups:
+            if is_hist_or_violin:
+                if "current_partition" in args:
                     # offsetgroup is needed mostly to prevent spacing issues in
                     # marginals
                     # not setting the offsetgroup and having both marginals set to box,
                     # violin, etc. leads to extra spacing in each marginal
                     # offsetgroup needs to be unique within the subchart as columns
                     # could have the same name
-                    fig.fig.update_traces(offsetgroup=f"{'-'.join(args['current_partition'])}{i}")
-                facet_key.extend([partition.get(self.facet_col, None), partition.get(self.facet_row, None)])
-            facet_key = tuple(facet_key)
-
-            if "preprocess_hist" in self.groups or "preprocess_violin" in self.groups:
-                if "current_partition" in args:
+                    fig.fig.update_traces(offsetgroup=f"{offsetgroup_prefix}{i}")
                     fig.fig.update_layout(legend_tracegroupgap=0)
                 else:
                     fig.fig.update_layout(showlegend=False)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from functools import partial
+from string import digits
 from typing import Any
 
 from plotly.graph_objs import Figure
@@ -8,6 +9,9 @@ from plotly.graph_objs import Figure
 from ..deephaven_figure import DeephavenFigure
 from ._update_wrapper import default_callback, unsafe_figure_update_wrapper
 
+# the layout keys, without their number, that are resized and reindexed when layering
+AXIS_TYPES = frozenset({"xaxis", "yaxis", "scene", "polar", "ternary"})
+
 
 def normalize_position(
         position: float,
@@ -313,7 +317,6 @@ def resize_fig(
     axes_remapping = {}
     new_axes = {}
     old_axes = []
-    type_ = None
 
     # keep track of the axis number within the chart so these axes can be
     # appropriately linked across charts
@@ -324,48 +327,36 @@ def resize_fig(
 
     for name, obj in fig_layout.items():
         # todo: coloraxis; thickness, len, x, y
-        if name.startswith("xaxis"):
-            axis_indices["xaxis"] += 1
-            type_ = "xaxis"
-
-        elif name.startswith("yaxis"):
-            axis_indices["yaxis"] += 1
-            type_ = "yaxis"
-
-        elif name.startswith("scene"):
-            type_ = "scene"
-
-        elif name.startswith("polar"):
-            type_ = "polar"
-
-        elif name.startswith("ternary"):
-            type_ = "ternary"
+        # axis names are the type followed by an optional number, such as xaxis2
+        type_ = name.rstrip(digits)
+        if type_ not in AXIS_TYPES:
+            continue
 
-        if type_:
-            # axes start at 1, and the 1 is dropped
-            num = "" if new_axes_start[type_] == 1 else new_axes_start[type_]
-            new_axes_start[type_] += 1
-            old_axes.append(name)
+        if type_ in axis_indices:
+            axis_indices[type_] += 1
 
-            update = get_axis_update(spec, type_)
+        # axes start at 1, and the 1 is dropped
+        num = "" if new_axes_start[type_] == 1 else new_axes_start[type_]
+        new_axes_start[type_] += 1
+        old_axes.append(name)
 
-            new_axis, old_trace_axis, new_trace_axis = resize_axis(
-                type_, name, obj, num, spec)
+        update = get_axis_update(spec, type_)
 
-            matches_update = match_axes(
-                type_,
-                spec,
-                matches_axes,
-                axis_indices,
-                new_trace_axis
-            )
+        new_axis, old_trace_axis, new_trace_axis = resize_axis(
+            type_, name, obj, num, spec)
 
-            obj.update(**update, **matches_update)
+        matches_update = match_axes(
+            type_,
+            spec,
+            matches_axes,
+            axis_indices,
+            new_trace_axis
+        )
 
-            new_axes[new_axis] = obj
-            axes_remapping[old_trace_axis] = new_trace_axis
+        obj.update(**update, **matches_update)
 
-        type_ = None
+        new_axes[new_axis] = obj
+        axes_remapping[old_trace_axis] = new_trace_axis
 
     if spec.get("wipe_layout", False):
         # completely wipe out the layout (and axes will be added back)
@@ -422,7 +413,8 @@ def fig_data_and_layout(
 
     """
     if specs:
-        return resize_fig(fig.to_dict()['data'], fig.to_dict()['layout'],
+        fig_dict = fig.to_dict()
+        return resize_fig(fig_dict['data'], fig_dict['layout'],
                           specs[i], new_axes_start, matches_axes)
 
     fig_layout = {}
@@ -14,6 +14,25 @@ from ._update_wrapper import unsafe_figure_update_wrapper
 from ..deephaven_figure import generate_figure, DeephavenFigure
 from ._update_wrapper import default_callback
 
+# layout scene args that need a _scene suffix so they are not converted to a list
+SCENE_ARGS = ("range_x", "range_y", "range_z", "log_x", "log_y", "log_z")
+
+# args that add markers to the mode of a line trace when set
+MARKER_MODE_ARGS = (
+    "markers", "symbol", "symbol_sequence", "symbol_map", "text",
+    "size", "size_sequence", "size_map"
+)
+MARKER_MODE_BY_VARS = ("symbol", "size")
+
+# args that request marginals be attached to the figure
+MARGINAL_ARGS = frozenset({"marginal", "marginal_x", "marginal_y"})
+
+# args that are copied from the main figure to its marginals
+MARG_ARGS = frozenset({
+    "x", "y", "by", "by_vars", "color", "hover_name", "labels",
+    "color_discrete_sequence", "color_discrete_map",
+})
+
 
 def validate_common_args(
         args: dict
@@ -37,7 +56,7 @@ def remap_scene_args(
       args: dict: The args to remap
 
     """
-    for arg in ["range_x", "range_y", "range_z", "log_x", "log_y", "log_z"]:
+    for arg in SCENE_ARGS:
         args[arg + '_scene'] = args.pop(arg)
 
 
@@ -57,43 +76,70 @@ def calculate_mode(
       The mode. Some combination of markers, lines, text, joined by '+'.
 
     """
-    modes = [base_mode]
-    if base_mode == "lines" and any([
-        args.get("markers", None),
-        args.get("symbol", None),
-        args.get("symbol_sequence", None),
-        args.get("symbol_map", None),
-        args.get("text", None),
-        args.get("size", None),
-        args.get("size_sequence", None),
-        args.get("size_map", None),
-        "symbol" in args.get("by_vars", []),
-        "size" in args.get("by_vars", []),
-    ]
+    has_text = args.get("text", None)
+    if base_mode == "lines" and (
+            any(args.get(arg, None) for arg in MARKER_MODE_ARGS)
+            or any(var in args.get("by_vars", []) for var in MARKER_MODE_BY_VARS)
     ):
-        modes.append("markers")
-    if args.get("text", None):
-        modes.append("text")
-    return "+".join(modes)
+        return "lines+markers+text" if has_text else "lines+markers"
+    return f"{base_mode}+text" if has_text else base_mode
+
+
+# args that style color and pattern shape, which are renamed per trace type
+COLOR_ARGS = ("color_discrete_sequence", "attached_color")
+PATTERN_SHAPE_ARGS = ("pattern_shape_sequence", "attached_pattern_shape")
+
+# for each group, the (args, suffixes) pairs to rename
+GROUP_SUFFIXES = {
+    "scatter": ((COLOR_ARGS, ("marker",)),),
+    "line": ((COLOR_ARGS, ("marker", "line")),),
+    "ecdf": ((COLOR_ARGS, ("marker", "line")),),
+    "bar": ((COLOR_ARGS, ("marker",)), (PATTERN_SHAPE_ARGS, ("bar",))),
+    "marker": ((COLOR_ARGS, ("marker",)),),
+    "always_attached": ((COLOR_ARGS + PATTERN_SHAPE_ARGS, ("markers",)),),
+    "area": ((PATTERN_SHAPE_ARGS, ("area",)),),
+}
+
+
+def get_suffixed_args(
+        groups: set[str]
+) -> dict[str, set[str]]:
+    """
+    Collect the suffixes to append to each arg for the specified groups.
+    Groups that share an (arg, suffix) pair only contribute it once.
+
+    Args:
+        groups: set[str]: The groups to collect suffixes for
+
+    Returns:
+        dict[str, set[str]]: A dictionary of arg to the suffixes to append
+    """
+    suffixed_args = {}
+    for group in groups:
+        for group_args, suffixes in GROUP_SUFFIXES.get(group, ()):
+            for arg in group_args:
+                suffixed_args.setdefault(arg, set()).update(suffixes)
+    return suffixed_args
 
 
 def append_suffixes(
-        args: list[str],
-        suffixes: list[str],
-        sync_dict: SyncDict
+        args: dict[str, Any],
+        suffixed_args: dict[str, set[str]]
 ) -> None:
     """
-    Append the suffixes in the list to the specified arg names. The args should be in sync_dict.
+    Rename args in place by appending the suffixes to the arg names. An arg
+    with multiple suffixes has its value copied to each suffixed name.
 
     Args:
-        args: list[str]: The args in sync_dict to rename
-        suffixes: list[str]: The suffixes to add to the specified args
-        sync_dict: SyncDict: The SyncDict that the args are in
+        args: dict[str, Any]: The args to rename
+        suffixed_args: dict[str, set[str]]: A dictionary of arg to the
+          suffixes to add to it
     """
-    for arg in args:
-        for suffix in suffixes:
-            if arg in sync_dict:
-                sync_dict.d[f"{arg}_{suffix}"] = sync_dict.will_pop(arg)
+    for arg, suffixes in suffixed_args.items():
+        if arg in args:
+            val = args.pop(arg)
+            for suffix in suffixes:
+                args[f"{arg}_{suffix}"] = val
 
 
 def apply_args_groups(
@@ -109,77 +155,25 @@ def apply_args_groups(
     """
     groups = groups if isinstance(groups, set) else {groups}
 
-    sync_dict = SyncDict(args)
-
     if "scatter" in groups:
         args["mode"] = calculate_mode("markers", args)
-        append_suffixes(
-            ["color_discrete_sequence", "attached_color"],
-            ["marker"],
-            sync_dict
-        )
 
     if "line" in groups:
         args["mode"] = calculate_mode("lines", args)
-        append_suffixes(
-            ["color_discrete_sequence", "attached_color"],
-            ["marker", "line"],
-            sync_dict
-        )
 
     if "ecdf" in groups:
         # ecdf should be forced to lines even if both "lines" and "markers" are False
         base_mode = "lines" if args["lines"] or not args["markers"] else "markers"
         args["mode"] = calculate_mode(base_mode, args)
-        append_suffixes(
-            ["color_discrete_sequence", "attached_color"],
-            ["marker", "line"],
-            sync_dict
-        )
 
     if 'scene' in groups:
-        for arg in ["range_x", "range_y", "range_z", "log_x", "log_y", "log_z"]:
-            args[arg + '_scene'] = args.pop(arg)
-
-    if 'bar' in groups:
-        append_suffixes(
-            ["color_discrete_sequence", "attached_color"],
-            ["marker"],
-            sync_dict
-        )
-        append_suffixes(
-            ["pattern_shape_sequence", "attached_pattern_shape"],
-            ["bar"],
-            sync_dict
-        )
-
-    if 'marker' in groups:
-        append_suffixes(
-            ["color_discrete_sequence", "attached_color"],
-            ["marker"],
-            sync_dict
-        )
-
-    if 'always_attached' in groups:
-        append_suffixes(
-            ["color_discrete_sequence", "attached_color",
-             "pattern_shape_sequence", "attached_pattern_shape"],
-            ["markers"],
-            sync_dict
-        )
-
-    if 'area' in groups:
-        append_suffixes(
-            ["pattern_shape_sequence", "attached_pattern_shape"],
-            ["area"],
-            sync_dict
-        )
+        remap_scene_args(args)
+
+    append_suffixes(args, get_suffixed_args(groups))
 
     if "webgl" in groups:
         args["render_mode"] = "webgl"
 
-    sync_dict.sync_pop()
-
 
 def process_args(
         args: dict[str, Any],
@@ -210,7 +204,7 @@ def process_args(
     validate_common_args(args)
 
     marg_args = None
-    if any(arg in args for arg in ["marginal", "marginal_x", "marginal_y"]):
+    if not MARGINAL_ARGS.isdisjoint(args):
         marg_args = get_marg_args(args)
         if "marginal" in args:
             var = "x" if args["x"] else "y"
@@ -232,60 +226,15 @@ def process_args(
         for old_arg, new_arg in remap.items():
             args[new_arg] = args.pop(old_arg)
 
-    update_wrapper = partial(
-        unsafe_figure_update_wrapper,
-        args.pop("unsafe_update_figure")
-    )
-
-    return update_wrapper(partitioned.create_figure())
+    unsafe_update_figure = args.pop("unsafe_update_figure")
 
+    fig = partitioned.create_figure()
 
-class SyncDict:
-    """A dictionary wrapper that will queue up keys to remove and remove them
-    all at once
+    # the default callback returns the figure unchanged, so there is nothing to wrap
+    if unsafe_update_figure is default_callback:
+        return fig
 
-
-    Args:
-      d: dict: the dictionary to wrap
-
-
-    """
-
-    def __init__(
-            self,
-            d: dict
-    ):
-        self.d = d
-        self.pop_set = set()
-
-    def __contains__(self, item):
-        return item in self.d
-
-    def will_pop(
-            self,
-            key: Any
-    ) -> Any:
-        """Add a key to the set of keys that will eventually be popped
-
-        Args:
-          key: The key to add to the set
-
-        Returns:
-          The value associated with the key that will be popped
-
-        """
-        self.pop_set.add(key)
-        return self.d[key]
-
-    def sync_pop(
-            self
-    ):
-        """Pop all elements from the dictionary that have been added to the pop
-        set
-
-        """
-        for k in self.pop_set:
-            self.d.pop(k)
+    return unsafe_figure_update_wrapper(unsafe_update_figure, fig)
 
 
 def set_shared_defaults(args: dict[str, Any]) -> None:
@@ -295,10 +244,10 @@ def set_shared_defaults(args: dict[str, Any]) -> None:
     Args:
         args: dict[str, str]: The args to set the shared defaults on
     """
-    args["by_vars"] = args.get("by_vars", ("color",))
-    args["unsafe_update_figure"] = args.get("unsafe_update_figure", default_callback)
-    args["x"] = args.get("x", None)
-    args["y"] = args.get("y", None)
+    args.setdefault("by_vars", ("color",))
+    args.setdefault("unsafe_update_figure", default_callback)
+    args.setdefault("x", None)
+    args.setdefault("y", None)
 
 
 def shared_violin(
@@ -313,8 +262,8 @@ def shared_violin(
         The DeephavenFigure created
     """
     set_shared_defaults(args)
-    args["violinmode"] = args.get("violinmode", "group")
-    args["points"] = args.get("points", "outliers")
+    args.setdefault("violinmode", "group")
+    args.setdefault("points", "outliers")
     return process_args(args, {"marker", "preprocess_violin", "supports_lists"}, px_func=px.violin)
 
 
@@ -330,8 +279,8 @@ def shared_box(
         The DeephavenFigure created
     """
     set_shared_defaults(args)
-    args["boxmode"] = args.get("boxmode", "group")
-    args["points"] = args.get("points", "outliers")
+    args.setdefault("boxmode", "group")
+    args.setdefault("points", "outliers")
     return process_args(args, {"marker", "preprocess_violin", "supports_lists"}, px_func=px.box)
 
 
@@ -347,7 +296,7 @@ def shared_strip(
         The DeephavenFigure created
     """
     set_shared_defaults(args)
-    args["stripmode"] = args.get("stripmode", "group")
+    args.setdefault("stripmode", "group")
     return process_args(args, {"marker", "preprocess_violin", "supports_lists"}, px_func=px.strip)
 
 
@@ -363,13 +312,13 @@ def shared_histogram(
         The DeephavenFigure created
     """
     set_shared_defaults(args)
-    args["barmode"] = args.get("barmode", "relative")
-    args["nbins"] = args.get("nbins", 10)
-    args["histfunc"] = args.get("histfunc", "count")
-    args["histnorm"] = args.get("histnorm", None)
-    args["cumulative"] = args.get("cumulative", False)
-    args["range_bins"] = args.get("range_bins", None)
-    args["barnorm"] = args.get("barnorm", None)
+    args.setdefault("barmode", "relative")
+    args.setdefault("nbins", 10)
+    args.setdefault("histfunc", "count")
+    args.setdefault("histnorm", None)
+    args.setdefault("cumulative", False)
+    args.setdefault("range_bins", None)
+    args.setdefault("barnorm", None)
 
     args["bargap"] = 0
     args["hist_val_name"] = args["histfunc"]
@@ -379,6 +328,14 @@ def shared_histogram(
     )
 
 
+MARGINAL_MAP = {
+    "histogram": shared_histogram,
+    "violin": shared_violin,
+    "rug": shared_strip,
+    "box": shared_box
+}
+
+
 def marginal_axis_update(
         matches: str = None
 ) -> dict[str, Any]:
@@ -418,16 +375,9 @@ def create_marginal(
       DeephavenFigure: The marginal figure
 
     """
-    if marginal == "histogram":
-        args["barmode"] = "overlay"
-    marginal_map = {
-        "histogram": shared_histogram,
-        "violin": shared_violin,
-        "rug": shared_strip,
-        "box": shared_box
-    }
-
-    fig_marg = marginal_map[marginal](**args)
+    # barmode is passed separately so it is not set on args shared between marginals
+    extra_args = {"barmode": "overlay"} if marginal == "histogram" else {}
+    fig_marg = MARGINAL_MAP[marginal](**args, **extra_args)
     fig_marg.fig.update_traces(showlegend=False)
 
     if marginal == "rug":
@@ -468,11 +418,9 @@ def attach_marginals(
     specs = []
 
     if marginal_x:
-        x_args = {
-            **args,
-            "x": data["x"]
-        }
-        figs.append(create_marginal(marginal_x, x_args, "x"))
+        args["x"] = data["x"]
+        figs.append(create_marginal(marginal_x, args, "x"))
+        args.pop("x")
         specs = [
             {'y': [0, 0.74]},
             {
@@ -483,11 +431,9 @@ def attach_marginals(
         ]
 
     if marginal_y:
-        y_args = {
-            **args,
-            "y": data["y"]
-        }
-        figs.append(create_marginal(marginal_y, y_args, "y"))
+        args["y"] = data["y"]
+        figs.append(create_marginal(marginal_y, args, "y"))
+        args.pop("y")
         if specs:
             specs[0]["x"] = [0, 0.745]
             specs[1]["x"] = [0, 0.745]
@@ -523,15 +469,4 @@ def get_marg_args(
         (data args dict, style args dict)
 
     """
-    marg_args = {
-        "x", "y", "by", "by_vars", "color", "hover_name", "labels",
-        "color_discrete_sequence", "color_discrete_map",
-    }
-
-    new_args = {}
-
-    for arg in marg_args:
-        if arg in args:
-            new_args[arg] = args[arg]
-
-    return new_args
+    return {arg: args[arg] for arg in MARG_ARGS & args.keys()}
@@ -52,12 +52,13 @@ def get_unique_names(
       dict[str, str]: A dictionary that maps orig_names to new names that are not found in the table
 
     """
-    if isinstance(table, PartitionedTable):
-        table = table.constituent_tables[0]
+    # partitioned tables know their constituent columns without pulling a constituent
+    columns = table.constituent_table_columns \
+        if isinstance(table, PartitionedTable) else table.columns
 
     new_names = {}
 
-    table_columns = {column.name for column in table.columns}
+    table_columns = {column.name for column in columns}
     for name in orig_names:
         new_name = name
         while new_name in table_columns or new_name in new_names:
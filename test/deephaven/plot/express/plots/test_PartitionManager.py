@@ -0,0 +1,206 @@
+import unittest
+
+from ..BaseTest import BaseTestCase
+
+
+class PartitionManagerTestCase(BaseTestCase):
+    def setUp(self) -> None:
+        from deephaven import new_table
+        from deephaven.column import char_col, double_col, int_col, string_col
+
+        self.source = new_table([
+            string_col("Category", ["A", "B", "A", "C"]),
+            int_col("X", [1, 2, 3, 4]),
+            int_col("Y", [1, 2, 3, 4]),
+            double_col("Y2", [1.5, 2.5, 3.5, 4.5]),
+            char_col("Y3", ["a", "b", "c", "d"]),
+        ])
+
+    def test_is_single_numeric_col(self):
+        from src.deephaven.plot.express.plots.PartitionManager import is_single_numeric_col
+
+        numeric_cols = {"X", "Y"}
+
+        self.assertTrue(is_single_numeric_col("X", numeric_cols))
+        self.assertTrue(is_single_numeric_col(["X"], numeric_cols))
+        self.assertFalse(is_single_numeric_col("Category", numeric_cols))
+        self.assertFalse(is_single_numeric_col(["Category"], numeric_cols))
+        self.assertFalse(is_single_numeric_col(["X", "Y"], numeric_cols))
+
+    def test_partitioned_table(self):
+        import src.deephaven.plot.express as dx
+
+        partitioned = self.source.partition_by("Category")
+
+        chart = dx.scatter(partitioned, x="X", y="Y").to_dict(self.exporter)
+        plotly = chart["plotly"]
+
+        # each trace is named after the key of its own constituent
+        self.assertEqual([trace["name"] for trace in plotly["data"]], ["A", "B", "C"])
+
+    def test_partitioned_table_duplicate_keys(self):
+        import src.deephaven.plot.express as dx
+        from deephaven import merge
+        from deephaven.table import PartitionedTable
+
+        partitioned = self.source.partition_by("Category")
+
+        # every key has two constituents, so the keys are not unique
+        duplicated = PartitionedTable.from_partitioned_table(
+            merge([partitioned.table, partitioned.table]),
+            key_cols=["Category"],
+            unique_keys=False,
+            constituent_column=partitioned.constituent_column,
+            constituent_table_columns=partitioned.constituent_table_columns,
+            constituent_changes_permitted=partitioned.constituent_changes_permitted
+        )
+
+        chart = dx.scatter(duplicated, x="X", y="Y").to_dict(self.exporter)
+        plotly = chart["plotly"]
+
+        self.assertEqual(
+            [trace["name"] for trace in plotly["data"]],
+            ["A", "B", "C", "A", "B", "C"]
+        )
+
+    def test_refreshing_partitioned_table(self):
+        import src.deephaven.plot.express as dx
+        from deephaven import input_table, merge
+        from deephaven.table import PartitionedTable
+
+        # an input table is refreshing, so the constituents are read from a live table
+        partitioned = input_table(init_table=self.source).partition_by("Category")
+
+        chart = dx.scatter(partitioned, x="X", y="Y").to_dict(self.exporter)
+        plotly = chart["plotly"]
+
+        self.assertEqual([trace["name"] for trace in plotly["data"]], ["A", "B", "C"])
+
+        # every key has two constituents, so the keys are not unique
+        duplicated = PartitionedTable.from_partitioned_table(
+            merge([partitioned.table, partitioned.table]),
+            key_cols=["Category"],
+            unique_keys=False,
+            constituent_column=partitioned.constituent_column,
+            constituent_table_columns=partitioned.constituent_table_columns,
+            constituent_changes_permitted=partitioned.constituent_changes_permitted
+        )
+
+        chart = dx.scatter(duplicated, x="X", y="Y").to_dict(self.exporter)
+        plotly = chart["plotly"]
+
+        self.assertEqual(
+            [trace["name"] for trace in plotly["data"]],
+            ["A", "B", "C", "A", "B", "C"]
+        )
+
+    def test_partitioned_table_style_columns(self):
+        import src.deephaven.plot.express as dx
+
+        partitioned = self.source.partition_by("Category")
+
+        chart = dx.scatter(partitioned, x="X", y="Y", symbol="Category").to_dict(self.exporter)
+        plotly = chart["plotly"]
+
+        self.assertEqual(
+            [trace["marker"]["symbol"] for trace in plotly["data"]],
+            ["circle", "diamond", "square"]
+        )
+
+        # styling by a column that is not a key column can't be matched to the partitions
+        with self.assertRaises(ValueError):
+            dx.scatter(partitioned, x="X", y="Y", symbol="Y")
+
+    def test_single_numeric_color_list(self):
+        import src.deephaven.plot.express as dx
+
+        chart = dx.scatter(
+            self.source, x="X", y="Y", color=["Y"], color_continuous_scale=["red", "blue"]
+        ).to_dict(self.exporter)
+        plotly = chart["plotly"]
+
+        # a one element list is treated the same as the column itself, so the
+        # column is bound to a continuous color axis instead of partitioning
+        self.assertEqual(len(plotly["data"]), 1)
+        self.assertEqual(plotly["data"][0]["marker"]["coloraxis"], "coloraxis")
+        self.assertIn("coloraxis", plotly["layout"])
+
+    def test_get_promoted_type(self):
+        from src.deephaven.plot.express.plots.PartitionManager import get_promoted_type
+
+        self.assertEqual(get_promoted_type({"int", "long"}), "long")
+        self.assertEqual(get_promoted_type({"int", "double"}), "double")
+        self.assertEqual(get_promoted_type({"short", "int", "float"}), "float")
+        self.assertEqual(get_promoted_type({"char", "int"}), "int")
+        self.assertEqual(get_promoted_type({"char", "long"}), "long")
+        self.assertEqual(get_promoted_type({"char", "short"}), "int")
+        self.assertIsNone(get_promoted_type({"int"}))
+        self.assertIsNone(get_promoted_type({"int", "java.lang.String"}))
+
+    def test_mixed_type_list(self):
+        import src.deephaven.plot.express as dx
+
+        chart = dx.line(self.source, x="X", y=["Y", "Y2"]).to_dict(self.exporter)
+        plotly, deephaven = chart["plotly"], chart["deephaven"]
+
+        self.assertEqual([trace["name"] for trace in plotly["data"]], ["Y", "Y2"])
+
+        expected_mappings = [
+            {
+                'table': 0,
+                'data_columns':
+                    {
+                        'X': ['/plotly/data/0/x'],
+                        'value': ['/plotly/data/0/y']
+                    }
+            },
+            {
+                'table': 0,
+                'data_columns':
+                    {
+                        'X': ['/plotly/data/1/x'],
+                        'value': ['/plotly/data/1/y']
+                    }
+            }
+        ]
+
+        self.assertEqual(deephaven["mappings"], expected_mappings)
+
+    def test_char_int_list(self):
+        import src.deephaven.plot.express as dx
+
+        chart = dx.line(self.source, x="X", y=["Y3", "Y"]).to_dict(self.exporter)
+        plotly, deephaven = chart["plotly"], chart["deephaven"]
+
+        self.assertEqual([trace["name"] for trace in plotly["data"]], ["Y3", "Y"])
+
+        expected_mappings = [
+            {
+                'table': 0,
+                'data_columns':
+                    {
+                        'X': ['/plotly/data/0/x'],
+                        'value': ['/plotly/data/0/y']
+                    }
+            },
+            {
+                'table': 0,
+                'data_columns':
+                    {
+                        'X': ['/plotly/data/1/x'],
+                        'value': ['/plotly/data/1/y']
+                    }
+            }
+        ]
+
+        self.assertEqual(deephaven["mappings"], expected_mappings)
+
+    def test_missing_list_column(self):
+        import src.deephaven.plot.express as dx
+
+        with self.assertRaises(ValueError):
+            dx.line(self.source, x="X", y=["Y", "Missing"])
+
+
+if __name__ == '__main__':
+    unittest.main()